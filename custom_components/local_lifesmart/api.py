@@ -1,4 +1,5 @@
 """LifeSmart API implementation."""
+import asyncio
 import socket
 import json
 import time
@@ -6,7 +7,7 @@ import hashlib
 import struct
 import logging
 from typing import Any, Dict
-from .const import API_PORT, REMARK, CMD_REPORT
+from .const import API_PORT, REMARK, CMD_GET, CMD_REPORT, CMD_SET
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -53,48 +54,87 @@ class LifeSmartAPI:
 
     async def send_command(self, obj: str, args: Dict[str, Any], pkg_type: int,timeout: float = 5) -> Dict[str, Any]:
         message = self.create_message(obj, args, pkg_type)
-        
+        loop = asyncio.get_running_loop()
+
         with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
-            sock.settimeout(timeout)
-            sock.sendto(message, (self.host, API_PORT))
-            
-            data, _ = sock.recvfrom(65535)
+            sock.setblocking(False)
+            await loop.sock_sendto(sock, message, (self.host, API_PORT))
+
+            try:
+                data, _ = await asyncio.wait_for(loop.sock_recvfrom(sock, 65535), timeout)
+            except asyncio.TimeoutError:
+                # Keep the message callers match on for socket timeouts
+                raise TimeoutError("timed out") from None
             response = json.loads(data[10:].decode('utf-8'))
-            
+
             return response
 
     async def discover_devices(self):
         args = {"me": "2d02"}
         return await self.send_command("eps", args, 1)
 
-    async def get_state_updates(self):
-        if not self._socket:
-            self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            self._socket.bind(('0.0.0.0', API_PORT))
-            self._socket.settimeout(None)
+    async def discover_devices_by_id(self, device_id: str, timeout: float = 5) -> Dict[str, Any]:
+        """Query a single device, returned in the same {"msg": [...]} shape as discover_devices."""
+        response = await self.send_command("ep", {"me": device_id}, CMD_GET, timeout)
+        if isinstance(response.get("msg"), dict):
+            response["msg"] = [response["msg"]]
+        return response
 
+    async def set_device_state(self, device_id: str, state: Dict[str, Any], timeout: float = 2) -> Dict[str, Any]:
+        """Set an endpoint value, e.g. state={"idx": "L1", "type": "0x81", "val": 1}."""
+        args = {"tag": "m", "me": device_id, **state}
+        return await self.send_command("ep", args, CMD_SET, timeout)
+
+    async def get_state_updates(self):
+        loop = asyncio.get_running_loop()
         try:
-            data, _ = self._socket.recvfrom(65535)
-            if len(data) > 10:
-                message = json.loads(data[10:].decode('utf-8'))
-                _LOGGER.debug("Received UDP message: %s", message)
-                
-                if 'msg' in message:
-                    msg = message['msg']
-                    if isinstance(msg, dict):
-                        return {
-                            'me': msg.get('me'),
-                            'idx': msg.get('idx'),
-                            'val': msg.get('data', {}).get('v', msg.get('val')),
-                            'type': msg.get('type')
-                        }
-                    
+            if not self._socket:
+                sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                try:
+                    sock.setblocking(False)
+                    sock.bind(('0.0.0.0', API_PORT))
+                except OSError:
+                    sock.close()
+                    raise
+                self._socket = sock
+
+            data, addr = await loop.sock_recvfrom(self._socket, 65535)
         except Exception as e:
-            _LOGGER.error("Error receiving state update: %s", str(e))
+            _LOGGER.debug("Error receiving state update: %s", str(e))
             if self._socket:
                 self._socket.close()
                 self._socket = None
+            raise
+
+        if len(data) > 10:
+            try:
+                message = json.loads(data[10:].decode('utf-8'))
+            except ValueError as e:
+                # A malformed packet is skipped, the socket is still fine
+                _LOGGER.debug("Ignoring malformed UDP message: %s", str(e))
+                return None
+            _LOGGER.debug("Received UDP message: %s", message)
+
+            if isinstance(message, dict) and 'msg' in message:
+                msg = message['msg']
+                if isinstance(msg, dict):
+                    data_field = msg.get('data')
+                    return {
+                        'me': msg.get('me'),
+                        'idx': msg.get('idx'),
+                        'val': data_field.get('v', msg.get('val')) if isinstance(data_field, dict) else msg.get('val'),
+                        'type': msg.get('type'),
+                        # Every hub pushes to the same port, so keep the sender
+                        'host': addr[0]
+                    }
         return None
+
+    def close_state_updates(self) -> None:
+        """Close the push-update socket so the port is released."""
+        if self._socket:
+            self._socket.close()
+            self._socket = None
+
     async def get_remote_list(self) -> Dict[str, Any]:
         """Retrieve IR remote list for devices."""
         args = {
@@ -103,14 +143,16 @@ class LifeSmartAPI:
         response = await self.send_command("spotremote", args, 3)
         
         if response and response.get("code") == 0 and "msg" in response:
-            remote_list = response["msg"]
+            remote_list = [remote for remote in response["msg"] if "id" in remote]
             all_keys = []
-            
-            for remote in remote_list:
-                if "id" in remote:
-                    keys = await self.get_remote_keys(remote["id"])
-                    if keys and keys.get("code") == 0 and "msg" in keys:
-                        all_keys.append({"remote": remote, "keys": keys["msg"]})
+
+            # Fetch the keys for every remote concurrently
+            results = await asyncio.gather(
+                *(self.get_remote_keys(remote["id"]) for remote in remote_list)
+            )
+            for remote, keys in zip(remote_list, results):
+                if keys and keys.get("code") == 0 and "msg" in keys:
+                    all_keys.append({"remote": remote, "keys": keys["msg"]})
             return all_keys
         return response
 
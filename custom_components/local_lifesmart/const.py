@@ -11,6 +11,7 @@ API_PORT = 12348
 API_VERSION = 1
 REMARK = "JL"
 PLATFORMS = ["switch", "sensor","cover" , "remote"]
+DATA_PUSH_BUSES = f"{DOMAIN}_push_buses"
 # Command Types
 CMD_GET = 1    # Query command
 CMD_SET = 3    # Control command
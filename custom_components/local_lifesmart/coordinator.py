@@ -2,17 +2,134 @@
 from datetime import timedelta
 
 import logging
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Optional
 import asyncio
+import random
 from asyncio import Lock
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 from .api import LifeSmartAPI
+from .const import API_PORT, DATA_PUSH_BUSES
 
 _LOGGER = logging.getLogger(__name__)
 
+PUSH_RETRY_DELAY = 1.0
+PUSH_MAX_RETRY_DELAY = 30.0
+PUSH_WARN_AFTER = 5
+
+def _backoff(attempt: int, base: float = 1.0, cap: float = 30.0, jitter: float = 0.5) -> float:
+    """Return a capped exponential retry delay with random jitter."""
+    # Clamp the exponent so an endless retry loop cannot overflow the float
+    return min(cap, base * (2 ** min(attempt, 16))) * (1 + random.uniform(-jitter, jitter))
+
+class LifeSmartPushBus:
+    """Single push-update reader per local port, routed to subscribers by hub host."""
+
+    def __init__(self, hass: HomeAssistant, api: LifeSmartAPI) -> None:
+        """Initialize the push bus."""
+        self.hass = hass
+        self.api = api
+        self._subscribers: Dict[str, List[Callable[[Dict[str, Any]], None]]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @callback
+    def subscribe(self, host: str, update_callback: Callable[[Dict[str, Any]], None]) -> Callable[[], None]:
+        """Subscribe to push updates sent by the hub at host."""
+        self._subscribers.setdefault(host, []).append(update_callback)
+        if self._task is None or self._task.done():
+            self._task = self.hass.async_create_background_task(
+                self._listen_for_updates(), f"LifeSmart push listener {API_PORT}"
+            )
+
+        @callback
+        def unsubscribe() -> None:
+            callbacks = self._subscribers.get(host, [])
+            if update_callback in callbacks:
+                callbacks.remove(update_callback)
+            if not callbacks:
+                self._subscribers.pop(host, None)
+            if not self._subscribers:
+                self._stop()
+
+        return unsubscribe
+
+    @callback
+    def _stop(self) -> None:
+        """Stop reading and forget this bus once nobody is listening."""
+        if self._task is not None and not self._task.done():
+            # The listener releases the push socket when it unwinds
+            self._task.cancel()
+        else:
+            self.api.close_state_updates()
+        self._task = None
+        buses = self.hass.data.get(DATA_PUSH_BUSES, {})
+        if buses.get(API_PORT) is self:
+            buses.pop(API_PORT)
+
+    @callback
+    def _dispatch(self, update: Dict[str, Any]) -> None:
+        """Hand an update to the subscribers of the hub that sent it."""
+        callbacks = self._subscribers.get(update.get('host'))
+        if not callbacks:
+            _LOGGER.debug("Ignoring push update from unknown host: %s", update)
+            return
+        for update_callback in list(callbacks):
+            try:
+                update_callback(update)
+            except Exception as e:
+                _LOGGER.error("Error handling push update %s: %s", update, str(e))
+
+    async def _listen_for_updates(self):
+        """Listen for push updates from devices, reconnecting with backoff."""
+        try:
+            retry_count = 0
+            warned = False
+            while True:
+                try:
+                    update = await self.api.get_state_updates()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    retry_count += 1
+                    if retry_count >= PUSH_WARN_AFTER and not warned:
+                        _LOGGER.warning(
+                            "Push update listener failed %d times, retrying with backoff up to %.0f seconds: %s",
+                            retry_count, PUSH_MAX_RETRY_DELAY, str(e)
+                        )
+                        warned = True
+                    else:
+                        _LOGGER.debug("Error in push update listener (attempt %d): %s", retry_count, str(e))
+                    await asyncio.sleep(_backoff(retry_count - 1, PUSH_RETRY_DELAY, PUSH_MAX_RETRY_DELAY))
+                    continue
+
+                if retry_count:
+                    if warned:
+                        _LOGGER.info("Push update listener recovered after %d failures", retry_count)
+                    retry_count = 0
+                    warned = False
+
+                if update:
+                    _LOGGER.debug("Received push update: %s", update)
+                    self._dispatch(update)
+        finally:
+            self.api.close_state_updates()
+
+@callback
+def async_get_push_bus(hass: HomeAssistant, api: LifeSmartAPI) -> LifeSmartPushBus:
+    """Return the shared push bus for the local push port, creating it if needed.
+
+    Every hub pushes to API_PORT, so all hubs share one bound socket and the
+    bus routes packets by sender address.
+    """
+    buses: Dict[int, LifeSmartPushBus] = hass.data.setdefault(DATA_PUSH_BUSES, {})
+    bus = buses.get(API_PORT)
+    if bus is None:
+        bus = buses[API_PORT] = LifeSmartPushBus(hass, api)
+    return bus
+
 class LifeSmartCoordinator(DataUpdateCoordinator):
     """Class to manage fetching data from Lifesmart API."""
 
@@ -28,65 +145,97 @@ class LifeSmartCoordinator(DataUpdateCoordinator):
             _LOGGER,
             name="LifeSmart",
             update_interval=timedelta(milliseconds=scan_interval),
+            always_update=False,
+            request_refresh_debouncer=Debouncer(
+                hass,
+                _LOGGER,
+                cooldown=0.5,
+                immediate=False,
+            ),
         )
         self.api = api
         self._available = True
-        self._lock = Lock()
-        self._push_task = None
+        self.devices: Dict[str, Any] = {}
+        self.device_info: Dict[str, Any] = {}
+        self._by_me: Dict[str, Dict[str, Any]] = {}
+        self._device_locks: Dict[str, Lock] = {}
+        self._unsub_push = async_get_push_bus(hass, api).subscribe(api.host, self._handle_push_update)
+
+    def _rebuild_index(self, data: Dict[str, Any]) -> None:
+        """Rebuild the device lookup keyed by `me`."""
+        msg = data.get("msg", []) if isinstance(data, dict) else []
+        self._by_me = {d["me"]: d for d in msg if isinstance(d, dict) and "me" in d}
+
+    @staticmethod
+    def _sort_by_me(data: Dict[str, Any]) -> Dict[str, Any]:
+        """Order devices by `me` so identical polls compare equal."""
+        if isinstance(data, dict) and isinstance(data.get("msg"), list):
+            data["msg"].sort(key=lambda d: str(d.get("me", "")) if isinstance(d, dict) else "")
+        return data
+
+    @callback
+    def _apply_push_update(self, device_id: str, idx: str, val: Any) -> None:
+        """Publish a pushed value if it changed the device's data."""
+        device = self._by_me.get(device_id)
+        if device is None:
+            # Unknown device, fetch the full device list once things settle
+            self.hass.async_create_task(self.async_request_refresh())
+            return
+
+        channels = device.get("data", {})
+        channel = channels.get(idx, {})
+        if "v" in channel and channel["v"] == val:
+            return
+
+        # Copy on change so the previous snapshot stays intact
+        new_device = {**device, "data": {**channels, idx: {**channel, "v": val}}}
+        new_data = {
+            **self.data,
+            "msg": [new_device if d is device else d for d in self.data.get("msg", [])],
+        }
+        _LOGGER.debug("Updated device %s idx %s to value %s", device_id, idx, val)
+
+        # Only this device changed, so patch the index instead of rebuilding it
+        self._by_me[device_id] = new_device
+
+        # Notify entities about the update
+        super().async_set_updated_data(new_data)
+
+    @callback
+    def async_set_updated_data(self, data: Dict[str, Any]) -> None:
+        """Manually update data and refresh the device index."""
+        self._rebuild_index(data)
+        super().async_set_updated_data(data)
         
     async def _async_update_data(self) -> Dict[str, Any]:
         """Fetch data from API."""
         try:
-            # Start push listener if not already running
-            if self._push_task is None or self._push_task.done():
-                self._push_task = asyncio.create_task(self._listen_for_updates())
-                
             # Fetch all devices
-            devices_data = await self.api.discover_devices()
+            devices_data = self._sort_by_me(await self.api.discover_devices())
+            self._rebuild_index(devices_data)
             self._available = True
             return devices_data
         except Exception as err:
             self._available = False
             raise UpdateFailed(f"Error communicating with API: {err}")
     
-    async def _listen_for_updates(self):
-        """Listen for push updates from devices."""
-        try:
-            while True:
-                update = await self.api.get_state_updates()
-                if update:
-                    # Process the update and update specific device state
-                    _LOGGER.debug("Received push update: %s", update)
-                    device_id = update.get('me')
-                    idx = update.get('idx')
-                    val = update.get('val')
-                    
-                    if device_id and idx is not None and val is not None and self.data:
-                        # Find and update the specific device in the data
-                        for device in self.data.get("msg", []):
-                            if device.get("me") == device_id:
-                                # Ensure data structure exists
-                                if "data" not in device:
-                                    device["data"] = {}
-                                if idx not in device["data"]:
-                                    device["data"][idx] = {}
-                                
-                                # Update the value
-                                device["data"][idx]["v"] = val
-                                _LOGGER.debug("Updated device %s idx %s to value %s", device_id, idx, val)
-                                break
-                    
-                    # Notify entities about the update
-                    self.async_set_updated_data(self.data)
-        except Exception as e:
-            _LOGGER.error("Error in push update listener: %s", str(e))
-            # Allow the task to be restarted on next update
-            self._push_task = None
-        self.devices: Dict[str, Any] = {}
-        self.device_info: Dict[str, Any] = {}
-        self._available = True
-        self._lock = Lock()
-        
+    @callback
+    def _handle_push_update(self, update: Dict[str, Any]) -> None:
+        """Process a push update from the shared bus."""
+        device_id = update.get('me')
+        idx = update.get('idx')
+        val = update.get('val')
+
+        if device_id and idx is not None and val is not None and self.data:
+            self._apply_push_update(device_id, idx, val)
+
+    async def async_shutdown(self) -> None:
+        """Leave the push bus, then shut down the coordinator."""
+        if self._unsub_push is not None:
+            self._unsub_push()
+            self._unsub_push = None
+        await super().async_shutdown()
+
     @property 
     def available(self) -> bool:
         """Return if coordinator is available."""
@@ -94,66 +243,39 @@ class LifeSmartCoordinator(DataUpdateCoordinator):
     def get_api(self) -> LifeSmartAPI:
         """Return the API instance."""
         return self.api
+
+    def _get_device_lock(self, device_id: str) -> Lock:
+        """Return the lock serializing writes to a single device.
+
+        Only call this from the event loop; the locks are asyncio locks.
+        """
+        lock = self._device_locks.get(device_id)
+        if lock is None:
+            lock = self._device_locks[device_id] = Lock()
+        return lock
     
     async def _async_get_device_data(self, device_id: str,timout: float=1.0) -> Dict[str, Any]:
         
         """Fetch single device data from API with retry logic."""
-        async with self._lock:
-            for attempt in range(3):  # Try 3 times
-                try:
-                    device_data = await asyncio.wait_for(
-                        self.api.discover_devices_by_id(device_id,timout),
-                        timeout=timout  
-                    )
-                    
-                    formatted_data = {
-                        "msg": []
-                    }
-                    
-                    if isinstance(device_data, dict) and "msg" in device_data:
-                        formatted_data["msg"].extend(device_data["msg"])
-                        
-                    return formatted_data
-
-                except asyncio.TimeoutError:
-                    if attempt == 2:  # Last attempt
-                        raise UpdateFailed(f"Error communicating with API for device {device_id}: timed out")
-                    await asyncio.sleep(1)  # Wait before retry
-                    
-                except Exception as err:
-                    raise UpdateFailed(f"Error communicating with API for device {device_id}: {err}")
-
-    async def _async_update_data(self , timout: float=1.0) -> Dict[str, Any]:
-        """Fetch data from API with retry logic."""
-       
         for attempt in range(3):  # Try 3 times
             try:
-                devices = await asyncio.wait_for(
-                    self.api.get_devices(),
-                    timeout=timout 
+                device_data = await asyncio.wait_for(
+                    self.api.discover_devices_by_id(device_id,timout),
+                    timeout=timout  
                 )
-                
-                formatted_data = {
-                    "msg": []
-                }
-                
-                if isinstance(devices, dict):
-                    for device_id, device_data in devices.items():
-                        if isinstance(device_data, dict):
-                            formatted_data["msg"].append(device_data)
-                            
-                return formatted_data
+
+                if isinstance(device_data, dict) and "msg" in device_data:
+                    return device_data
+                return {"msg": []}
 
             except asyncio.TimeoutError:
                 if attempt == 2:  # Last attempt
-                    raise UpdateFailed("Error communicating with API: timed out")
-                await asyncio.sleep(1)  # Wait before retry
+                    raise UpdateFailed(f"Error communicating with API for device {device_id}: timed out")
+                await asyncio.sleep(_backoff(attempt))  # Wait before retry
                 
             except Exception as err:
-                raise UpdateFailed(f"Error communicating with API: {err}")
+                raise UpdateFailed(f"Error communicating with API for device {device_id}: {err}")
 
-
-            
     def get_device(self, device_id: str) -> Dict[str, Any]:
         """Get device data by ID."""
         return self.devices.get(device_id, {})
@@ -171,11 +293,14 @@ class LifeSmartCoordinator(DataUpdateCoordinator):
         if not self.available:
             return
         try:
-            result = await self.hass.async_add_executor_job(
-                self.api.set_device_state, device_id, state, time_out
-            )
+            async with self._get_device_lock(device_id):
+                result = await asyncio.wait_for(
+                    self.api.set_device_state(device_id, state, time_out),
+                    timeout=time_out
+                )
             _LOGGER.debug("Device state set successfully: %s", result)
-            await self.async_refresh()
+            # Coalesce bursts of writes into a single trailing refresh
+            await self.async_request_refresh()
             return
         except asyncio.TimeoutError:
             _LOGGER.error("Timeout occurred while setting device state")
@@ -1,5 +1,6 @@
 """Platform for LifeSmart switch integration."""
 import logging
+import re
 from datetime import timedelta
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
@@ -25,6 +26,17 @@ PORT_1 = "P2"
 PORT_2 = "P3"
 PORT_3 = "P4"
 
+_EPN_RE = re.compile(r"\{\$EPN\}")
+_ON_VALUES = frozenset({1, "1", 0x81, "0x81"})
+
+def _is_on(value) -> bool:
+    """Return True if a raw endpoint value means the channel is on."""
+    try:
+        return value in _ON_VALUES
+    except TypeError:
+        # Unhashable payloads (dicts, lists) are never a valid on-code
+        return False
+
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
@@ -34,24 +46,21 @@ async def async_setup_entry(
     api = hass.data[DOMAIN][config_entry.entry_id].api
     devices_data = await api.discover_devices()
     
-    switches = []
+    channels = []
     if isinstance(devices_data, dict) and "msg" in devices_data:
         for device in devices_data["msg"]:
             if device.get("devtype") in SUPPORTED_SWITCH_TYPES:
                 data = device.get("data", {})
-                for channel in ["L1", "L2", "L3"]:
+                device_name = device.get('name', 'Switch')
+                for channel in ("L1", "L2", "L3"):
                     if channel in data:
-                        channel_data = data[channel]
-                        channel_name = channel_data.get('name', channel).replace('{$EPN}', '').strip()
-                        name = f"{device.get('name', 'Switch')} {channel_name}"
-                        switches.append(
-                            LifeSmartSwitch(
-                                api=api,
-                                device=device,
-                                idx=channel,
-                                name=name.strip()
-                            )
-                        )
+                        channel_name = _EPN_RE.sub('', data[channel].get('name', channel)).strip()
+                        channels.append((device, channel, f"{device_name} {channel_name}".strip()))
+
+    switches = [
+        LifeSmartSwitch(api=api, device=device, idx=channel, name=name)
+        for device, channel, name in channels
+    ]
 
     async_add_entities(switches)
 
@@ -64,6 +73,9 @@ class LifeSmartSwitch(SwitchEntity):
         self._attr_name = name
         self._available = True
         self._remove_tracker = None
+        self._polling = False
+        # Bumped when a command starts and ends so overlapping polls are dropped
+        self._command_seq = 0
         
         device_type = device.get('devtype')
         hub_id = device.get('agt', '')
@@ -71,9 +83,16 @@ class LifeSmartSwitch(SwitchEntity):
         
         self.entity_id = f"{DOMAIN}.{generate_entity_id(device_type, hub_id, device_id, idx)}"
         self._attr_unique_id = f"lifesmart_switch_{device_id}_{idx}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, device_id)},
+            name=device.get('name'),
+            manufacturer=MANUFACTURER,
+            model=device_type,
+            sw_version=device.get('epver'),
+        )
         
         initial_state = device.get("data", {}).get(idx, {}).get("v", 0)
-        self._state = bool(initial_state)
+        self._attr_is_on = _is_on(initial_state)
 
     async def async_added_to_hass(self):
         """When entity is added to hass."""
@@ -94,6 +113,11 @@ class LifeSmartSwitch(SwitchEntity):
     @callback
     async def _async_update_state(self, *_):
         """Fetch state from device."""
+        if self._polling:
+            # The previous poll is still waiting for the hub
+            return
+        self._polling = True
+        command_seq = self._command_seq
         try:
             args = {
                 "tag": "m",
@@ -103,63 +127,67 @@ class LifeSmartSwitch(SwitchEntity):
                 "val": 0
             }
             response = await self._api.send_command("ep", args, CMD_GET)
+            if command_seq != self._command_seq:
+                # A command was sent meanwhile, this reading may predate it
+                return
             if response.get("code") == 0 and "msg" in response:
                 new_state = response["msg"]["data"][self._idx]["v"]
-                self._state = bool(new_state)
+                is_on = _is_on(new_state)
+                if is_on == self._attr_is_on and self._available:
+                    return
+                self._attr_is_on = is_on
                 self._available = True
                 _LOGGER.debug(
                     "Switch %s state updated: %s (value=%s)", 
                     self.entity_id, 
-                    "on" if self._state else "off",
+                    "on" if self._attr_is_on else "off",
                     new_state
                 )
-            self.async_write_ha_state()
+                self.async_write_ha_state()
+            else:
+                _LOGGER.debug("Switch %s state query failed with code: %s", self.entity_id, response.get("code"))
+                self._set_available(False)
         except Exception as ex:
             _LOGGER.error(f"Error updating switch state: {ex} device= {self._device} idx={self._idx}  ")
-            self._available = False
+            self._set_available(False)
+        finally:
+            self._polling = False
+
+    @callback
+    def _set_available(self, available: bool) -> None:
+        """Update availability, writing state only when it flips."""
+        if self._available == available:
+            return
+        self._available = available
+        self.async_write_ha_state()
 
     @property
     def available(self):
         """Return True if entity is available."""
         return self._available
 
-    @property
-    def is_on(self):
-        """Return true if device is on."""
-        return self._state
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Return device info."""
-        return DeviceInfo(
-            identifiers={(DOMAIN, self._device['me'])},
-            name=self._attr_name,
-            manufacturer=MANUFACTURER,
-            model=self._device.get('devtype'),
-            sw_version=self._device.get('epver'),
-        )
     async def async_turn_on(self, **kwargs):
         """Turn the switch on."""
-        previous_state = self._state
-        self._state = True
+        previous_state = self._attr_is_on
+        self._attr_is_on = True
         self.async_write_ha_state()  # Immediate UI feedback
         
         success = await self._send_command(1)
         if not success:
             # Rollback UI state if command failed
-            self._state = previous_state
+            self._attr_is_on = previous_state
             self.async_write_ha_state()
             _LOGGER.warning("Failed to turn on switch, UI state reverted")
     async def async_turn_off(self, **kwargs):
         """Turn the switch off."""
-        previous_state = self._state
-        self._state = False
+        previous_state = self._attr_is_on
+        self._attr_is_on = False
         self.async_write_ha_state()  # Immediate UI feedback
         
         success = await self._send_command(0)
         if not success:
             # Rollback UI state if command failed
-            self._state = previous_state
+            self._attr_is_on = previous_state
             self.async_write_ha_state()
             _LOGGER.warning("Failed to turn off switch, UI state reverted")
 
@@ -174,6 +202,7 @@ class LifeSmartSwitch(SwitchEntity):
             "type": VAL_TYPE_ON if value == 1 else VAL_TYPE_OFF,
             "val": value
         }
+        self._command_seq += 1
         try:
             response = await self._api.send_command("ep", args, CMD_SET, 2)
             if response.get("code") == 0:
@@ -192,4 +221,6 @@ class LifeSmartSwitch(SwitchEntity):
             else:
                 _LOGGER.error("Error sending command: %s", str(ex))
                 self._available = False
-                return False
\ No newline at end of file
+                return False
+        finally:
+            self._command_seq += 1
\ No newline at end of file